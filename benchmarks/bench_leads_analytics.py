@@ -0,0 +1,72 @@
+# benchmarks/bench_leads_analytics.py
+#
+# Times the pandas and DuckDB report backends on synthetic leads.
+#
+#   python benchmarks/bench_leads_analytics.py            # 1M and 10M leads
+#   python benchmarks/bench_leads_analytics.py 100000     # custom sizes
+#
+# The synthetic frame is already in the prepare_leads() shape, so only the
+# report computation (plus the Parquet write for DuckDB) is timed.
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leads_analytics import compute_report_data_pandas  # noqa: E402
+from leads_analytics_duckdb import write_leads_parquet, compute_report_data  # noqa: E402
+
+NOW = datetime(2025, 6, 15, 12, 0, 0)
+DEFAULT_SIZES = [1_000_000, 10_000_000]
+
+
+def synthetic_leads(n, seed=0):
+    """n leads spread over the last 5 years, with test/prueba leads,
+    Nimo leads, missing values and a skewed city distribution."""
+    rng = np.random.default_rng(seed)
+    seconds = rng.integers(0, 5 * 365 * 24 * 3600, n)
+    create_date = pd.Timestamp(NOW) - pd.to_timedelta(seconds, unit='s')
+
+    name_pool = np.array(["Lead", "Presupuestador web", "  presupuestador", "Test lead", "Prueba", None], dtype=object)
+    email_pool = np.array(["lead@example.com", "test@example.com", None], dtype=object)
+    city_pool = np.array([f"City {i}" for i in range(200)] + [None], dtype=object)
+    country_pool = np.array(["Spain", "Portugal", "France", "Mexico", None], dtype=object)
+
+    df = pd.DataFrame({
+        'create_date': np.sort(create_date.values)[::-1],
+        'name': name_pool[rng.choice(len(name_pool), n, p=[0.6, 0.15, 0.05, 0.1, 0.05, 0.05])],
+        'email_from': email_pool[rng.choice(len(email_pool), n, p=[0.85, 0.05, 0.1])],
+        'city': city_pool[np.minimum(rng.zipf(1.5, n) - 1, len(city_pool) - 1)],
+        'country_name': country_pool[rng.choice(len(country_pool), n, p=[0.5, 0.1, 0.2, 0.15, 0.05])],
+    })
+    for col in ['name', 'email_from', 'city', 'country_name']:
+        df[col] = df[col].astype("string")
+    return df
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(sizes):
+    print(f"{'leads':>12} {'pandas':>10} {'duckdb write':>14} {'duckdb query':>14}")
+    for n in sizes:
+        df = synthetic_leads(n)
+        _, t_pandas = timed(compute_report_data_pandas, df, NOW)
+        with tempfile.TemporaryDirectory() as tmp:
+            parquet_path = os.path.join(tmp, "leads.parquet")
+            _, t_write = timed(write_leads_parquet, df, parquet_path)
+            _, t_query = timed(compute_report_data, parquet_path, NOW)
+        print(f"{n:>12,} {t_pandas:>9.2f}s {t_write:>13.2f}s {t_query:>13.2f}s")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
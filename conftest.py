@@ -0,0 +1,4 @@
+# conftest.py
+#
+# Keeps the repository root on sys.path so tests/ can import the report
+# modules when run with plain `pytest`.
@@ -0,0 +1,104 @@
+# leads_analytics.py
+#
+# Report data for weekly_categorized_leads.py (Parts 2-4), pandas backend.
+# leads_analytics_duckdb.py implements the same interface on DuckDB; both
+# return the dict built by compute_report_data_pandas().
+
+import numpy as np
+import pandas as pd
+
+CATEGORIES = ["Internacional", "Scoobic team", "Nimo"]
+TEXT_COLUMNS = ['name', 'email_from', 'city']
+
+
+def prepare_leads(df):
+    """Clean the raw Odoo leads frame in place: parse create_date, turn
+    Odoo's False (empty field) into missing values and flatten
+    country_id into country_name."""
+    df['create_date'] = pd.to_datetime(df['create_date'])
+    for col in TEXT_COLUMNS:
+        df[col] = df[col].replace({False: None}).astype("string")
+    df['country_name'] = (
+        df['country_id'].astype(object)
+        .where(lambda s: s.ne(False))
+        .str.get(1)
+        .astype("string")
+    )
+    return df
+
+
+def report_windows(now):
+    """Start of the 30-day, 24-month and 12-month windows used by the report."""
+    window_30d_start = now - pd.Timedelta(days=30)
+    month_24_start = (now.replace(day=1) - pd.DateOffset(months=24)).to_pydatetime()
+    month_12_start = (now.replace(day=1) - pd.DateOffset(months=12)).to_pydatetime()
+    return window_30d_start, month_24_start, month_12_start
+
+
+def top_cities(city_counts, n=3):
+    # Ties are broken by city name so both backends pick the same cities
+    city_counts = city_counts.sort_index(kind='stable').sort_values(ascending=False, kind='stable')
+    return city_counts.head(n)
+
+
+def _monthly_counts(frame):
+    year_month = frame['create_date'].dt.to_period('M').dt.to_timestamp()
+    monthly = (
+        frame
+        .groupby([year_month.rename('year_month'), 'category'])
+        .size()
+        .unstack(fill_value=0)
+        .reindex(columns=CATEGORIES, fill_value=0)
+        .sort_index()
+    )
+    return monthly[(monthly.sum(axis=1) > 0)]
+
+
+def compute_report_data_pandas(df, now):
+    """Compute the report data from a frame prepared with prepare_leads().
+
+    Returns a dict with excluded_count, totals_30d, monthly_counts_24m,
+    monthly_counts_cy and top3_per_month.
+    """
+    window_30d_start, month_24_start, month_12_start = report_windows(now)
+
+    # Exclude leads whose name or email_from contain "test" or "prueba" (case-insensitive)
+    mask_exclude = (
+        df['name'].str.contains("test|prueba", case=False, na=False) |
+        df['email_from'].str.contains("test|prueba", case=False, na=False)
+    )
+    excluded_count = int(mask_exclude.sum())
+    included_df = df.loc[~mask_exclude, ['create_date', 'city']]
+
+    # Non Spain/Portugal -> Internacional, "presupuestador..." -> Nimo, else Scoobic team
+    is_domestic = df['country_name'].isin(["Spain", "Portugal"]).fillna(False)[~mask_exclude]
+    is_nimo = df['name'].str.strip().str.lower().str.startswith("presupuestador", na=False)[~mask_exclude]
+    included_df['category'] = np.select(
+        [~is_domestic.to_numpy(bool), is_nimo.to_numpy(bool)],
+        ["Internacional", "Nimo"],
+        default="Scoobic team"
+    )
+
+    # Last 30 days (PDF A)
+    df_30d = included_df[included_df['create_date'] >= window_30d_start]
+    totals_30d = df_30d['category'].value_counts().reindex(CATEGORIES, fill_value=0)
+
+    # Last 24 months (PDF B) and current year (PDF C)
+    monthly_counts_24m = _monthly_counts(included_df[included_df['create_date'] >= month_24_start])
+    monthly_counts_cy = _monthly_counts(included_df[included_df['create_date'].dt.year == now.year])
+
+    # Last 12 months top 3 cities (PDF D)
+    df_12m = included_df[included_df['create_date'] >= month_12_start]
+    year_month_12m = df_12m['create_date'].dt.to_period('M').dt.to_timestamp()
+    top3_per_month = {}
+    for ym, group in df_12m.groupby(year_month_12m):
+        city_counts = group['city'].fillna("Unknown").value_counts()
+        top3_per_month[ym] = top_cities(city_counts)
+
+    return {
+        'excluded_count': excluded_count,
+        'totals_30d': totals_30d,
+        'monthly_counts_24m': monthly_counts_24m,
+        'monthly_counts_cy': monthly_counts_cy,
+        'top3_per_month': top3_per_month,
+    }
@@ -0,0 +1,184 @@
+# leads_analytics_duckdb.py
+#
+# Optional DuckDB backend for weekly_categorized_leads.py.
+# Enable it with LEADS_BACKEND=duckdb (requires `pip install duckdb`).
+#
+# The prepared leads are written to a Parquet file (LEADS_PARQUET,
+# replaced on every run) and the exclusion, categorisation, windowed
+# groupbys and top cities run as multi-threaded DuckDB queries that read
+# that file once. This speeds up the aggregations only: the script still
+# fetches all leads into one pandas frame first, so peak memory is the
+# same as with the pandas backend and no history builds up on disk.
+# Only the small aggregated results come back as pandas objects, in the
+# same shape as compute_report_data_pandas().
+
+import pandas as pd
+
+from leads_analytics import CATEGORIES, report_windows
+
+try:
+    import duckdb
+except ImportError:  # optional dependency
+    duckdb = None
+
+# Characters Python's str.strip() removes (str.isspace()), as an RE2 class.
+# RE2's \s is ASCII-only, so e.g. a leading non-breaking space would
+# otherwise categorise differently from the pandas backend.
+UNICODE_WHITESPACE = (
+    r"[\t\n\x0b\x0c\r\x1c-\x1f \x{85}\x{a0}\x{1680}\x{2000}-\x{200a}"
+    r"\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}]"
+)
+
+# One scan of the Parquet data: exclusion flag and category per lead.
+# NOTE: pandas' str.strip() + startswith() == optional leading whitespace.
+CATEGORIZED_SQL = """
+    CREATE TEMP TABLE categorized AS
+    SELECT
+        create_date,
+        city,
+        contains(lower(coalesce(name, '')), 'test') OR
+        contains(lower(coalesce(name, '')), 'prueba') OR
+        contains(lower(coalesce(email_from, '')), 'test') OR
+        contains(lower(coalesce(email_from, '')), 'prueba') AS excluded,
+        CASE
+            WHEN country_name IS NULL OR country_name NOT IN ('Spain', 'Portugal')
+                THEN 'Internacional'
+            WHEN regexp_matches(lower(coalesce(name, '')), '^{whitespace}*presupuestador')
+                THEN 'Nimo'
+            ELSE 'Scoobic team'
+        END AS category
+    FROM read_parquet({parquet})
+"""
+
+
+def _require_duckdb():
+    if duckdb is None:
+        raise Exception("LEADS_BACKEND=duckdb requires the 'duckdb' package (pip install duckdb).")
+
+
+def _sql_path(parquet_path):
+    # Quote a file path as a SQL string literal
+    return "'" + str(parquet_path).replace("'", "''") + "'"
+
+
+def write_leads_parquet(df, parquet_path):
+    """Write the frame prepared with prepare_leads() to Parquet, keeping
+    only the columns the report queries use (create_date, name,
+    email_from, city, country_name)."""
+    _require_duckdb()
+
+    con = duckdb.connect()
+    try:
+        con.register("leads_frame", df[['create_date', 'name', 'email_from', 'city', 'country_name']])
+        # Casts keep all-null text columns typed as VARCHAR
+        con.execute(
+            f"""
+            COPY (
+                SELECT
+                    CAST(create_date AS TIMESTAMP) AS create_date,
+                    CAST(name AS VARCHAR) AS name,
+                    CAST(email_from AS VARCHAR) AS email_from,
+                    CAST(city AS VARCHAR) AS city,
+                    CAST(country_name AS VARCHAR) AS country_name
+                FROM leads_frame
+            ) TO {_sql_path(parquet_path)} (FORMAT PARQUET)
+            """
+        )
+    finally:
+        con.close()
+
+
+def _monthly_counts(con, where_sql, params):
+    # Month x category counts, pivoted like groupby().size().unstack()
+    counts = con.execute(
+        f"""
+        SELECT date_trunc('month', create_date) AS year_month, category, count(*) AS n
+        FROM categorized
+        WHERE NOT excluded AND {where_sql}
+        GROUP BY 1, 2
+        """,
+        params
+    ).df()
+    monthly = (
+        counts
+        .pivot(index='year_month', columns='category', values='n')
+        .reindex(columns=CATEGORIES)
+        .fillna(0)
+        .astype('int64')
+        .sort_index()
+    )
+    monthly.index = pd.DatetimeIndex(monthly.index, name='year_month')
+    monthly.columns.name = 'category'
+    return monthly[(monthly.sum(axis=1) > 0)]
+
+
+def compute_report_data(parquet_path, now):
+    """Run all report aggregations over the Parquet file.
+
+    Returns the same dict as leads_analytics.compute_report_data_pandas().
+    """
+    _require_duckdb()
+
+    window_30d_start, month_24_start, month_12_start = report_windows(now)
+
+    con = duckdb.connect()
+    try:
+        con.execute(CATEGORIZED_SQL.format(parquet=_sql_path(parquet_path), whitespace=UNICODE_WHITESPACE))
+
+        excluded_count = con.execute(
+            "SELECT count(*) FILTER (WHERE excluded) FROM categorized"
+        ).fetchone()[0]
+
+        # Last 30 days: totals per category
+        rows_30d = con.execute(
+            """
+            SELECT category, count(*) FROM categorized
+            WHERE NOT excluded AND create_date >= ?
+            GROUP BY 1
+            """,
+            [window_30d_start]
+        ).fetchall()
+        totals_30d = pd.Series(dict(rows_30d), dtype='int64').reindex(CATEGORIES, fill_value=0)
+
+        monthly_counts_24m = _monthly_counts(con, "create_date >= ?", [month_24_start])
+        monthly_counts_cy = _monthly_counts(con, "year(create_date) = ?", [now.year])
+
+        # Last 12 months: top 3 cities per month (ties broken by city name,
+        # same as leads_analytics.top_cities)
+        top_rows = con.execute(
+            """
+            SELECT year_month, city, n FROM (
+                SELECT
+                    year_month, city, n,
+                    row_number() OVER (PARTITION BY year_month ORDER BY n DESC, city) AS rank
+                FROM (
+                    SELECT
+                        date_trunc('month', create_date) AS year_month,
+                        coalesce(city, 'Unknown') AS city,
+                        count(*) AS n
+                    FROM categorized
+                    WHERE NOT excluded AND create_date >= ?
+                    GROUP BY 1, 2
+                )
+            )
+            WHERE rank <= 3
+            ORDER BY year_month, rank
+            """,
+            [month_12_start]
+        ).df()
+    finally:
+        con.close()
+
+    top3_per_month = {}
+    for ym, group in top_rows.groupby('year_month', sort=True):
+        top3_per_month[pd.Timestamp(ym)] = pd.Series(
+            group['n'].astype('int64').values, index=group['city'].values
+        )
+
+    return {
+        'excluded_count': int(excluded_count),
+        'totals_30d': totals_30d,
+        'monthly_counts_24m': monthly_counts_24m,
+        'monthly_counts_cy': monthly_counts_cy,
+        'top3_per_month': top3_per_month,
+    }
@@ -0,0 +1,130 @@
+# tests/test_leads_analytics.py
+#
+# Parity tests: the DuckDB backend must return the same report data as
+# the pandas backend for the same Odoo leads.
+#
+# Install the test dependencies with `pip install -r requirements-dev.txt`
+# and run `pytest` from the repository root.
+
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from leads_analytics import CATEGORIES, prepare_leads, compute_report_data_pandas
+
+pytest.importorskip("duckdb")
+
+import leads_analytics_duckdb as duckdb_backend  # noqa: E402
+
+NOW = datetime(2025, 6, 15, 12, 0, 0)
+SPAIN = [68, "Spain"]
+PORTUGAL = [183, "Portugal"]
+FRANCE = [75, "France"]
+
+
+def lead(create_date, name="Lead", email_from="lead@example.com", city="Madrid", country_id=SPAIN):
+    # Same shape as a crm.lead search_read record (False = empty field)
+    return {
+        'id': 0,
+        'name': name,
+        'email_from': email_from,
+        'create_date': create_date,
+        'city': city,
+        'country_id': country_id,
+    }
+
+
+def leads_frame(records):
+    records = sorted(records, key=lambda r: r['create_date'], reverse=True)  # 'create_date desc'
+    for i, record in enumerate(records, start=1):
+        record['id'] = i
+    return prepare_leads(pd.DataFrame(records))
+
+
+def run_both(records, tmp_path):
+    df = leads_frame(records)
+    expected = compute_report_data_pandas(df, NOW)
+    parquet_path = tmp_path / "leads.parquet"
+    duckdb_backend.write_leads_parquet(df, parquet_path)
+    actual = duckdb_backend.compute_report_data(parquet_path, NOW)
+    return expected, actual
+
+
+def assert_same_report(expected, actual):
+    assert actual['excluded_count'] == expected['excluded_count']
+    assert actual['totals_30d'].tolist() == expected['totals_30d'].tolist()
+    assert list(actual['totals_30d'].index) == CATEGORIES
+    for key in ['monthly_counts_24m', 'monthly_counts_cy']:
+        assert list(actual[key].columns) == CATEGORIES
+        assert list(actual[key].index) == list(expected[key].index)
+        assert actual[key].values.tolist() == expected[key].values.tolist()
+    assert list(actual['top3_per_month']) == list(expected['top3_per_month'])
+    for ym, expected_top in expected['top3_per_month'].items():
+        actual_top = actual['top3_per_month'][ym]
+        assert list(actual_top.items()) == list(expected_top.items())
+
+
+def test_exclusion_and_categories(tmp_path):
+    records = [
+        lead("2025-06-10 09:00:00", name="Presupuestador web", country_id=SPAIN),
+        lead("2025-06-10 10:00:00", name="  PRESUPUESTADOR 2", country_id=PORTUGAL),
+        lead("2025-06-11 10:00:00", name="Scoobic lead", country_id=SPAIN),
+        lead("2025-06-11 11:00:00", name="\xa0Presupuestador web", country_id=SPAIN),
+        lead("2025-06-11 12:00:00", name="\u2003presupuestador", country_id=PORTUGAL),
+        lead("2025-06-12 10:00:00", name="Presupuestador fr", country_id=FRANCE),
+        lead("2025-06-12 11:00:00", name="No country", country_id=False),
+        lead("2025-06-13 10:00:00", name="My TEST lead"),
+        lead("2025-06-13 11:00:00", email_from="Prueba@example.com"),
+        lead("2025-05-01 10:00:00", name="Older lead", country_id=PORTUGAL),
+        lead("2024-12-01 10:00:00", name="Last year"),
+        lead("2022-01-01 10:00:00", name="Outside 24 months"),
+    ]
+    expected, actual = run_both(records, tmp_path)
+
+    assert expected['excluded_count'] == 2
+    assert expected['totals_30d'].tolist() == [2, 1, 4]
+    assert_same_report(expected, actual)
+
+
+def test_top3_city_ties_match(tmp_path):
+    # Arrives in create_date desc order as Zeta, Zeta, Mid, Mid, Alpha, Alpha, Beta, Beta
+    cities = ["Zeta", "Zeta", "Mid", "Mid", "Alpha", "Alpha", "Beta", "Beta"]
+    records = [
+        lead(f"2025-06-{10 - i:02d} 10:00:00", city=city)
+        for i, city in enumerate(cities)
+    ]
+    expected, actual = run_both(records, tmp_path)
+
+    top = expected['top3_per_month'][pd.Timestamp("2025-06-01")]
+    assert list(top.index) == ["Alpha", "Beta", "Mid"]
+    assert_same_report(expected, actual)
+
+
+def test_all_false_text_columns(tmp_path):
+    records = [
+        lead("2025-06-10 10:00:00", name=False, email_from=False, city=False, country_id=False),
+        lead("2025-06-11 10:00:00", name=False, email_from=False, city=False, country_id=False),
+        lead("2025-06-12 10:00:00", name=False, email_from=False, city=False, country_id=False),
+    ]
+    expected, actual = run_both(records, tmp_path)
+
+    assert expected['totals_30d'].tolist() == [3, 0, 0]
+    top = expected['top3_per_month'][pd.Timestamp("2025-06-01")]
+    assert list(top.items()) == [("Unknown", 3)]
+    assert_same_report(expected, actual)
+
+
+def test_empty_windows(tmp_path):
+    # Only old leads: nothing in the last 30 days, 12/24 months or current year
+    records = [
+        lead("2020-03-01 10:00:00", city="Madrid"),
+        lead("2020-04-01 10:00:00", name="test lead"),
+    ]
+    expected, actual = run_both(records, tmp_path)
+
+    assert expected['totals_30d'].tolist() == [0, 0, 0]
+    assert expected['monthly_counts_24m'].empty
+    assert expected['monthly_counts_cy'].empty
+    assert expected['top3_per_month'] == {}
+    assert_same_report(expected, actual)
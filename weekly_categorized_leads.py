@@ -12,7 +12,9 @@ from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
 from email import encoders
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
+
+from leads_analytics import CATEGORIES, prepare_leads, compute_report_data_pandas
 
 # ----------------------------
 # Part 1: Fetch Odoo Data
@@ -46,96 +48,36 @@ print(f"Fetched {len(leads)} leads from Odoo.")
 df = pd.DataFrame(leads)
 
 # ----------------------------
-# Part 2: Pre-filtering & Cleaning
-# ----------------------------
-df['create_date'] = pd.to_datetime(df['create_date'])
-
-# Exclude leads whose name or email_from contain "test" or "prueba" (case-insensitive)
-mask_exclude = (
-    df['name'].str.lower().str.contains("test", na=False) |
-    df['name'].str.lower().str.contains("prueba", na=False) |
-    df['email_from'].str.lower().str.contains("test", na=False) |
-    df['email_from'].str.lower().str.contains("prueba", na=False)
-)
-excluded_df = df[mask_exclude].copy()
-included_df = df[~mask_exclude].copy()
-excluded_count = len(excluded_df)
-print(f"Excluded {excluded_count} leads (test/prueba).")
-
-# ----------------------------
-# Part 3: Categorize All Included Leads
+# Parts 2-4: Cleaning, Categorization & Time-Windowed Counts
 # ----------------------------
-included_df['country_name'] = included_df['country_id'].apply(
-    lambda x: x[1] if isinstance(x, (list, tuple)) and len(x) >= 2 else None
-)
-
-def categorize(row):
-    cname = row['country_name']
-    nm_lower = (row['name'] or "").strip().lower()
-    if cname not in ["Spain", "Portugal"]:
-        return "Internacional"
-    elif nm_lower.startswith("presupuestador"):
-        return "Nimo"
-    else:
-        return "Scoobic team"
+# LEADS_BACKEND=pandas (default) computes the report data in memory;
+# LEADS_BACKEND=duckdb writes the leads to Parquet and computes it with
+# DuckDB queries (see leads_analytics.py / leads_analytics_duckdb.py).
+# DuckDB only speeds up the aggregations; the fetch above is still in memory.
+LEADS_BACKEND = os.getenv("LEADS_BACKEND", "pandas").lower()
+LEADS_PARQUET = os.getenv("LEADS_PARQUET", "leads.parquet")
 
-included_df['category'] = included_df.apply(categorize, axis=1)
-
-# --------------------------------------------------------------------------------------
-# Part 4: Time-Windowed Subsets & Data Preprocessing for Charts
-# --------------------------------------------------------------------------------------
+if LEADS_BACKEND not in ("pandas", "duckdb"):
+    raise Exception(f"Unknown LEADS_BACKEND '{LEADS_BACKEND}' (expected 'pandas' or 'duckdb').")
 
+prepare_leads(df)
 now = datetime.utcnow()
-
-### 4.1 Last 30 Days (for PDF A: 3-bar “to be printed”)
-window_30d_start = now - timedelta(days=30)
-mask_30d = included_df['create_date'] >= window_30d_start
-df_30d = included_df[mask_30d].copy()
-totals_30d = df_30d['category'].value_counts().reindex(
-    ["Internacional", "Scoobic team", "Nimo"], fill_value=0
-)
-
-### 4.2 Last 24 Months (for PDF B: monthly stacked history)
-month_24_start = (now.replace(day=1) - pd.DateOffset(months=24)).to_pydatetime()
-mask_24m = included_df['create_date'] >= month_24_start
-df_24m = included_df[mask_24m].copy()
-df_24m['year_month'] = df_24m['create_date'].dt.to_period('M').dt.to_timestamp()
-monthly_counts_24m = (
-    df_24m
-    .groupby(['year_month', 'category'])
-    .size()
-    .unstack(fill_value=0)
-    .reindex(columns=["Internacional", "Scoobic team", "Nimo"], fill_value=0)
-    .sort_index()
-)
-monthly_counts_24m = monthly_counts_24m[(monthly_counts_24m.sum(axis=1) > 0)]
-
-### 4.3 Current Year (for PDF C: grouped bars by month)
 current_year = now.year
-mask_cy = included_df['create_date'].dt.year == current_year
-df_cy = included_df[mask_cy].copy()
-df_cy['year_month'] = df_cy['create_date'].dt.to_period('M').dt.to_timestamp()
-monthly_counts_cy = (
-    df_cy
-    .groupby(['year_month', 'category'])
-    .size()
-    .unstack(fill_value=0)
-    .reindex(columns=["Internacional", "Scoobic team", "Nimo"], fill_value=0)
-    .sort_index()
-)
-monthly_counts_cy = monthly_counts_cy[(monthly_counts_cy.sum(axis=1) > 0)]
 
-### 4.4 Last 12 Months Top 3 Cities (for PDF D)
-month_12_start = (now.replace(day=1) - pd.DateOffset(months=12)).to_pydatetime()
-mask_12m = included_df['create_date'] >= month_12_start
-df_12m = included_df[mask_12m].copy()
-df_12m['year_month'] = df_12m['create_date'].dt.to_period('M').dt.to_timestamp()
+if LEADS_BACKEND == "duckdb":
+    from leads_analytics_duckdb import write_leads_parquet, compute_report_data
 
-top3_per_month = {}
-for ym, group in df_12m.groupby('year_month'):
-    city_counts = group['city'].fillna("Unknown").value_counts()
-    top_cities = city_counts.head(3)
-    top3_per_month[ym] = top_cities
+    write_leads_parquet(df, LEADS_PARQUET)
+    report_data = compute_report_data(LEADS_PARQUET, now)
+else:
+    report_data = compute_report_data_pandas(df, now)
+
+excluded_count = report_data['excluded_count']
+totals_30d = report_data['totals_30d']                  # PDF A
+monthly_counts_24m = report_data['monthly_counts_24m']  # PDF B
+monthly_counts_cy = report_data['monthly_counts_cy']    # PDF C
+top3_per_month = report_data['top3_per_month']          # PDF D
+print(f"Excluded {excluded_count} leads (test/prueba).")
 
 # --------------------------------------------------------------------------------------
 # Part 5: Generate PDF A: "weekly_lead_categories_to_be_printed.pdf"
@@ -143,7 +85,7 @@ for ym, group in df_12m.groupby('year_month'):
 pdf_A = "weekly_lead_categories_to_be_printed.pdf"
 figA, axA = plt.subplots(figsize=(8, 6))
 
-labels_A = ["Internacional", "Scoobic team", "Nimo"]
+labels_A = CATEGORIES
 values_A = [totals_30d[label] for label in labels_A]
 barsA = axA.bar(labels_A, values_A, color=['tab:blue', 'tab:orange', 'tab:green'])
 
@@ -176,7 +118,7 @@ with PdfPages(pdf_B) as pdf:
     x_B = monthly_counts_24m.index.to_pydatetime()
     colors = ['tab:blue', 'tab:orange', 'tab:green']
 
-    for i, cat in enumerate(["Internacional", "Scoobic team", "Nimo"]):
+    for i, cat in enumerate(CATEGORIES):
         vals = monthly_counts_24m[cat].values
         bars = axB.bar(
             x_B,
@@ -242,7 +184,7 @@ with PdfPages(pdf_C) as pdf:
     colors = ['tab:blue', 'tab:orange', 'tab:green']
 
     # 2) Plot each category at x_pos + i*width
-    for i, cat in enumerate(["Internacional", "Scoobic team", "Nimo"]):
+    for i, cat in enumerate(CATEGORIES):
         vals = monthly_counts_cy[cat].values
         bars = axC.bar(
             x_pos + i * width,